@@ -1,7 +1,9 @@
 @echo off
 pip install streamlit==1.37.1
 pip install pandas==2.2.2
-pip install requests==2.32.3
+pip install httpx[http2]==0.27.2
 pip install openpyxl==3.1.5
 pip install xlsxwriter==3.2.0
+pip install orjson==3.10.7
+pip install pyarrow==17.0.0
 pause
@@ -1,14 +1,36 @@
 # app.py
 import datetime as dt
+import gc
+import hashlib
 import io
 import json
-from typing import List, Dict
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
 
 import importlib
+import httpx
 import pandas as pd
-import requests
 import streamlit as st
 
+# orjson is much faster at decoding the (potentially multi-MB) API responses;
+# fall back to the stdlib if it isn't installed.
+try:
+    import orjson
+
+    def json_dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+    json_loads = orjson.loads
+except ImportError:
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    json_loads = json.loads
+
 # -----------------------------
 # Streamlit page setup
 # -----------------------------
@@ -16,14 +38,6 @@ st.set_page_config(page_title="CPCB EPR Dashboard Scraper", page_icon="♻️",
 st.title("♻️ CPCB EPR Dashboard Scraper")
 st.caption("Fetch PIBO application details by Applicant Type and Status from CPCB EPR Plastic dashboard API.")
 
-# -----------------------------
-# Networking setup (suppress SSL warnings since verify=False)
-# -----------------------------
-try:
-    requests.packages.urllib3.disable_warnings()  # type: ignore[attr-defined]
-except Exception:
-    pass
-
 # -----------------------------
 # Constants & helpers
 # -----------------------------
@@ -44,13 +58,242 @@ PREFIX_MAP = {
     "Importer": "Imp-",
 }
 
+COLUMNS = ["Name", "Address", "Email", "Category"]
+
+# Every (applicant, status) API job, resolved once at import:
+# (applicant, status_ui, status_api, status_text, category_label).
+JOB_SPECS = [
+    (
+        applicant,
+        status_ui,
+        STATUS_MAP[status_ui][0],
+        STATUS_MAP[status_ui][1],
+        f"{PREFIX_MAP[applicant]}{STATUS_MAP[status_ui][1]}",
+    )
+    for applicant in APPLICANT_TYPES
+    for status_ui in STATUSES_UI
+]
+
+JOB_SPEC_BY_KEY = {(spec[0], spec[1]): spec for spec in JOB_SPECS}
+
+# Every label the Category column can hold for a successful job, in the same
+# applicant-major order the sidebar lists them.
+CATEGORY_LABELS = [spec[4] for spec in JOB_SPECS]
+
+# For tagging rows of a batched response: the API may echo either the status
+# code or its display text, so accept both.
+STATUS_LOOKUP = {
+    **{status_api: status_ui for status_ui, (status_api, _text) in STATUS_MAP.items()},
+    **{status_text: status_ui for status_ui, (_api, status_text) in STATUS_MAP.items()},
+}
+
+# Arrow-backed strings take far less memory than object columns and let
+# dedup / nunique / CSV export run in Arrow compute kernels. Without pyarrow,
+# fall back to pandas' own string dtype (the parquet cache is then skipped).
+STRING_DTYPE = (
+    "string[pyarrow]" if importlib.util.find_spec("pyarrow") is not None else "string"
+)
+
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36",
     "Content-Type": "application/json",
+    # Ask for a compressed body; httpx decodes both of these without extras.
+    "Accept-Encoding": "gzip, deflate",
 }
 
-def build_payload(status_api: str, status_text: str, applicant_type: str, count_value: int) -> str:
-    return json.dumps(
+RETRY_STATUSES = {502, 503, 504}
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+
+# The batched request is only an optimization, so don't let a slow connect
+# hold up the per-job fallback; reads keep the full budget for large bodies.
+BATCH_TIMEOUT = httpx.Timeout(60, connect=10, pool=10)
+
+@st.cache_resource
+def get_client() -> httpx.Client:
+    """
+    One shared client, kept across Streamlit reruns. It offers HTTP/2, so if
+    the server negotiates it the parallel API calls can share one connection.
+    The pool still allows one connection per job, so a server that only speaks
+    HTTP/1.1 keeps the calls parallel instead of queueing them.
+    """
+    transport = httpx.HTTPTransport(
+        http2=True,
+        verify=False,  # mirrors your original script; enable in production if possible
+        limits=httpx.Limits(
+            max_connections=len(JOB_SPECS), max_keepalive_connections=len(JOB_SPECS)
+        ),
+        retries=MAX_RETRIES,
+    )
+    return httpx.Client(transport=transport, timeout=60, headers=HEADERS)
+
+class TokenBucket:
+    """
+    Simple thread-safe token bucket used to cap outbound requests per second,
+    so the parallel scrape doesn't trip the CPCB API's throttling.
+    """
+
+    def __init__(self, rps: float, capacity: Optional[float] = None):
+        self.rps = float(rps)
+        self.capacity = float(capacity if capacity is not None else rps)
+        self.tokens = self.capacity
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.last) * self.rps)
+            self.last = now
+            # Take the token now (possibly going negative) and sleep off the
+            # deficit outside the lock, so waiters queue up in order.
+            self.tokens -= 1
+            wait = -self.tokens / self.rps if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+@st.cache_resource
+def get_rate_limiter() -> TokenBucket:
+    # Cached so the limit applies per process, not per script rerun.
+    return TokenBucket(rps=5)
+
+def post_json(
+    client: httpx.Client,
+    limiter: TokenBucket,
+    payload: bytes,
+    timeout=httpx.USE_CLIENT_DEFAULT,
+) -> httpx.Response:
+    # The transport only retries failed connects, so retry gateway errors here.
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        resp = client.post(API_URL, content=payload, timeout=timeout)
+        if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return resp
+        time.sleep(RETRY_BACKOFF * (2 ** attempt))
+
+@st.cache_resource
+def get_batch_support() -> Dict[str, Optional[bool]]:
+    # Per-process memo of whether the API accepts array parameters, so the
+    # probe request is only paid once. None means not probed yet.
+    return {"supported": None}
+
+# Decoding and tidying hundreds of thousands of small objects would otherwise
+# set off repeated GC passes. gc.disable() is process-wide, so only wrap the
+# CPU-bound parts (never network waits) and restore whatever state we found.
+@contextmanager
+def gc_paused():
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def extract_rows(resp: httpx.Response) -> List[Dict]:
+    resp.raise_for_status()
+    data = json_loads(resp.content)
+    return (
+        data.get("data", {})
+        .get("tableData", {})
+        .get("bodyContent", [])
+    )
+
+def fetch_batched(
+    client: httpx.Client,
+    limiter: TokenBucket,
+    specs: List[tuple],
+    count_value: int,
+    batch_support: Dict[str, Optional[bool]],
+) -> Optional[pd.DataFrame]:
+    """
+    Fetch every selected job in one request if the API supports it, else None
+    so the caller falls back to one request per job.
+    """
+    if batch_support["supported"] is False:
+        return None
+    try:
+        if batch_support["supported"] is None:
+            # Cheap probe: a few rows are enough to see whether arrays are
+            # accepted and whether rows say which applicant/status they belong to.
+            probe = extract_rows(
+                post_json(client, limiter, build_batch_payload(specs, 1), timeout=BATCH_TIMEOUT)
+            )
+            batch_support["supported"] = (
+                bool(probe) and tidy_batched_rows(probe, specs, 1, require_all=False) is not None
+            )
+            if not batch_support["supported"]:
+                return None
+        resp = post_json(
+            client, limiter, build_batch_payload(specs, count_value), timeout=BATCH_TIMEOUT
+        )
+        with gc_paused():
+            rows = extract_rows(resp)
+    except httpx.HTTPStatusError as e:
+        # A 4xx means the server rejects array parameters; remember that.
+        # 5xx is treated like a network error below: fall back this run only.
+        if e.response.is_client_error:
+            batch_support["supported"] = False
+        return None
+    except (ValueError, AttributeError):
+        # Undecodable or unexpectedly shaped body: not a batching API.
+        batch_support["supported"] = False
+        return None
+    except httpx.HTTPError:
+        # Timeouts / connection errors say nothing about batching support.
+        return None
+    # A response that fills the combined budget may have starved some jobs of
+    # their own countValue rows, so only the per-job path can be trusted then.
+    if not rows or len(rows) >= int(count_value) * len(specs):
+        return None
+    # Anything unexpected in the full response also means: use the per-job path.
+    with gc_paused():
+        return tidy_batched_rows(rows, specs, count_value)
+
+def fetch_per_job(
+    client: httpx.Client, limiter: TokenBucket, jobs: List[tuple]
+) -> Tuple[List[pd.DataFrame], bool]:
+    frames: List[pd.DataFrame] = []
+    failed = False
+
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        futures = [
+            (category_label, executor.submit(post_json, client, limiter, payload))
+            for category_label, payload in jobs
+        ]
+
+        # Collect in submission order (not completion order) so the rows come
+        # out in the same applicant/status order on every run.
+        for category_label, future in futures:
+            try:
+                resp = future.result()
+                with gc_paused():
+                    rows = extract_rows(resp)
+                    if not rows:
+                        continue  # nothing to tidy; skip building an empty frame
+
+                    frames.append(tidy_rows(rows, category_label))
+
+            except (httpx.HTTPError, ValueError) as e:
+                failed = True
+                # Keep context visible in the table on failures
+                frames.append(
+                    pd.DataFrame(
+                        [["", "", "", f"{category_label} (ERROR: {e})"]],
+                        columns=COLUMNS,
+                        dtype=STRING_DTYPE,
+                    )
+                )
+
+    return frames, failed
+
+# Durable cache of full scrape results, so a restarted app doesn't have to hit
+# the API again for filters it has already seen.
+CACHE_DIR = Path(__file__).parent / ".cache"
+CACHE_TTL_SECONDS = 6 * 60 * 60
+
+def build_payload(status_api: str, status_text: str, applicant_type: str, count_value: int) -> bytes:
+    return json_dumps(
         {
             "status": status_api,
             "countValue": int(count_value),
@@ -59,65 +302,180 @@ def build_payload(status_api: str, status_text: str, applicant_type: str, count_
         }
     )
 
-def tidy_rows(rows: List[Dict], category_label: str) -> List[Dict]:
-    out = []
-    for row in rows:
-        out.append(
-            {
-                "Name": row.get("company", "") or "",
-                "Address": row.get("address", "") or "",
-                "Email": row.get("email", "") or "",
-                "Category": category_label,
-            }
-        )
-    return out
-
-@st.cache_data(show_spinner=False)
-def scrape(selected_types: List[str], selected_statuses: List[str], count_value: int) -> pd.DataFrame:
-    collected: List[Dict] = []
-
-    for applicant in selected_types:
-        for status_ui in selected_statuses:
-            status_api, status_text = STATUS_MAP[status_ui]
-            cat_prefix = PREFIX_MAP[applicant]
-            category_label = f"{cat_prefix}{status_text}"
-
-            payload = build_payload(status_api, status_text, applicant, count_value)
+def build_batch_payload(specs: List[tuple], count_value: int) -> bytes:
+    """
+    Single payload asking for every selected (applicant, status) at once via
+    array parameters. countValue is scaled to the combined budget of all jobs;
+    tidy_batched_rows re-applies the per-job cap.
+    """
+    return json_dumps(
+        {
+            "status": sorted({spec[2] for spec in specs}),
+            "countValue": int(count_value) * len(specs),
+            "statusText": sorted({spec[3] for spec in specs}),
+            "applicantType": sorted({spec[0] for spec in specs}),
+        }
+    )
 
-            try:
-                resp = requests.post(
-                    API_URL,
-                    headers=HEADERS,
-                    data=payload,
-                    verify=False,   # mirrors your original script; enable in production if possible
-                    timeout=60,
-                )
-                resp.raise_for_status()
-                data = resp.json()
+def tidy_rows(rows: List[Dict], category_label: str) -> pd.DataFrame:
+    df = pd.DataFrame(rows, columns=["company", "address", "email"], dtype=STRING_DTYPE).fillna("")
+    df.columns = ["Name", "Address", "Email"]
+    # Category is constant within a job, so de-duplicating here on the three
+    # data columns is equivalent to a full-row drop_duplicates() on the result.
+    df = df.drop_duplicates(subset=["Name", "Address", "Email"], keep="first", ignore_index=True)
+    df["Category"] = pd.Series(category_label, index=df.index, dtype=STRING_DTYPE)
+    return df
 
-                rows = (
-                    data.get("data", {})
-                    .get("tableData", {})
-                    .get("bodyContent", [])
-                )
+def tidy_batched_rows(
+    rows: List[Dict], specs: List[tuple], count_value: int, require_all: bool = True
+) -> Optional[pd.DataFrame]:
+    """
+    Tag each row of a batched response with its Category from the row's own
+    applicantType/status fields. Returns None if any row can't be tagged or
+    falls outside the selected jobs, or (with require_all) if a selected job
+    is missing from the response.
+    """
+    label_by_job = {(spec[0], spec[1]): spec[4] for spec in specs}
+    df = pd.DataFrame(
+        rows, columns=["company", "address", "email", "applicantType", "status"], dtype=STRING_DTYPE
+    ).fillna("")
+    labels = [
+        label_by_job.get((applicant, STATUS_LOOKUP.get(status)))
+        for applicant, status in zip(df["applicantType"], df["status"])
+    ]
+    if any(label is None for label in labels):
+        return None
+    if require_all and set(labels) != set(label_by_job.values()):
+        return None
+    df = df[["company", "address", "email"]]
+    df.columns = ["Name", "Address", "Email"]
+    df["Category"] = pd.Series(labels, index=df.index, dtype=STRING_DTYPE)
+    # Same row order and per-job countValue cap as the per-job path.
+    groups = df.groupby("Category", sort=False)
+    df = pd.concat(
+        [groups.get_group(spec[4]).head(count_value) for spec in specs if spec[4] in groups.groups],
+        ignore_index=True,
+    )
+    return df.drop_duplicates(subset=COLUMNS, keep="first", ignore_index=True)
 
-                collected.extend(tidy_rows(rows, category_label))
+def finalize_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Arrow strings for the data columns and a Categorical for Category, which
+    only ever holds a handful of distinct labels.
+    """
+    df = df.astype({"Name": STRING_DTYPE, "Address": STRING_DTYPE, "Email": STRING_DTYPE})
+    # Error rows carry their own "<label> (ERROR: ...)" text; keep them as
+    # extra categories rather than turning them into NaN.
+    extra = [c for c in df["Category"].unique() if c not in CATEGORY_LABELS]
+    df["Category"] = pd.Categorical(df["Category"], categories=CATEGORY_LABELS + extra)
+    return df
 
-            except requests.RequestException as e:
-                # Keep context visible in the table on failures
-                collected.append(
-                    {
-                        "Name": "",
-                        "Address": "",
-                        "Email": "",
-                        "Category": f"{category_label} (ERROR: {e})",
-                    }
-                )
+def cache_path(selected_types: List[str], selected_statuses: List[str], count_value: int) -> Path:
+    key = hashlib.sha256(
+        json.dumps(
+            # Selection order is part of the key: rows come out in that order.
+            {
+                "types": list(selected_types),
+                "statuses": list(selected_statuses),
+                "count": int(count_value),
+            },
+            sort_keys=True,
+        ).encode("utf-8")
+    ).hexdigest()
+    return CACHE_DIR / f"{key}.parquet"
+
+class PartialScrapeError(Exception):
+    """
+    Raised when some API jobs failed. Carries the frame (with its ERROR rows)
+    so the UI can still show it, while keeping it out of both caches:
+    st.cache_data does not cache exceptions.
+    """
 
-    df = pd.DataFrame(collected, columns=["Name", "Address", "Email", "Category"])
-    df = df.drop_duplicates().reset_index(drop=True)
+    def __init__(self, df: pd.DataFrame):
+        super().__init__("Some API calls failed; partial results were not cached.")
+        self.df = df
+
+def cache_version(path: Path) -> float:
+    return path.stat().st_mtime if path.exists() else 0.0
+
+def scrape_uncached(
+    selected_types: List[str],
+    selected_statuses: List[str],
+    count_value: int,
+    force_refresh: bool = False,
+) -> pd.DataFrame:
+    path = cache_path(selected_types, selected_statuses, count_value)
+    if (
+        not force_refresh
+        and path.exists()
+        and time.time() - path.stat().st_mtime < CACHE_TTL_SECONDS
+    ):
+        try:
+            return finalize_dtypes(pd.read_parquet(path))
+        except Exception:
+            pass  # unreadable cache file (or no parquet engine); just scrape again
+
+    # Applicant-major, in the order the filters were selected.
+    specs = [
+        JOB_SPEC_BY_KEY[(applicant, status_ui)]
+        for applicant in selected_types
+        for status_ui in selected_statuses
+    ]
+    if not specs:
+        return finalize_dtypes(pd.DataFrame(columns=COLUMNS, dtype=STRING_DTYPE))
+
+    # Every (applicant, status) combination is an independent API call, so
+    # build them all upfront and fire them concurrently.
+    jobs = [
+        (category_label, build_payload(status_api, status_text, applicant, count_value))
+        for applicant, _status_ui, status_api, status_text, category_label in specs
+    ]
+
+    # Resolve shared resources here; the worker threads have no Streamlit
+    # script context to call the cached getters from.
+    client = get_client()
+    limiter = get_rate_limiter()
+    batch_support = get_batch_support()
+
+    # One round trip for everything when the API takes array parameters.
+    batched = None
+    if len(specs) > 1:
+        batched = fetch_batched(client, limiter, specs, count_value, batch_support)
+    if batched is not None:
+        frames, failed = [batched], False
+    else:
+        frames, failed = fetch_per_job(client, limiter, jobs)
+
+    if frames:
+        df = pd.concat(frames, ignore_index=True, copy=False)
+    else:
+        df = pd.DataFrame(columns=COLUMNS, dtype=STRING_DTYPE)
+    df = finalize_dtypes(df)
+
+    # Never cache partial results; a failed job should be retried next time.
+    if failed:
+        raise PartialScrapeError(df)
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        df.to_parquet(path, compression="zstd", index=False)
+    except Exception:
+        pass  # caching is best-effort (e.g. read-only dir, pyarrow not installed)
     return df
 
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=16)
+def scrape(
+    selected_types: List[str],
+    selected_statuses: List[str],
+    count_value: int,
+    disk_version: float,
+) -> pd.DataFrame:
+    """
+    In-memory cache over scrape_uncached. disk_version (the parquet file's
+    mtime) is part of the key, so once a forced refresh rewrites the file,
+    every session picks up the new result instead of a stale in-memory one.
+    """
+    return scrape_uncached(selected_types, selected_statuses, count_value)
+
 # ---------- Excel export (explicit engine detection) ----------
 def has_module(name: str) -> bool:
     return importlib.util.find_spec(name) is not None
@@ -136,13 +494,47 @@ def pick_excel_engine() -> str:
         "via requirements.txt."
     )
 
+# Export bytes are cached alongside the scrape results they come from, with the
+# same bounds, so widget reruns never re-serialize an unchanged DataFrame.
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=16)
 def to_excel_bytes(df: pd.DataFrame) -> bytes:
+    """
+    Serialize in constant-memory / write-only mode so large scrapes are
+    streamed row by row instead of buffering the whole sheet.
+    Only called once the user asks for the Excel file; cached per DataFrame.
+    """
     buffer = io.BytesIO()
     engine = pick_excel_engine()
-    with pd.ExcelWriter(buffer, engine=engine) as writer:
-        df.to_excel(writer, sheet_name="Scraped", index=False)
+    if engine == "xlsxwriter":
+        import xlsxwriter
+
+        # constant_memory only keeps rows written in order, so write whole rows
+        # ourselves; df.to_excel writes column by column and would lose data.
+        wb = xlsxwriter.Workbook(buffer, {"constant_memory": True})
+        ws = wb.add_worksheet("Scraped")
+        ws.write_row(0, 0, list(df.columns))
+        for row_idx, row in enumerate(df.itertuples(index=False, name=None), start=1):
+            ws.write_row(row_idx, 0, row)
+        wb.close()
+    else:
+        import openpyxl
+
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Scraped")
+        ws.append(list(df.columns))
+        for row in df.itertuples(index=False, name=None):
+            ws.append(row)
+        wb.save(buffer)
     return buffer.getvalue(), engine
 
+@st.cache_data(show_spinner=False, ttl=3600, max_entries=16)
+def to_csv_bytes(df: pd.DataFrame) -> bytes:
+    # Write straight into a bytes buffer in chunks instead of building the
+    # whole CSV as one str and then encoding a second copy of it.
+    buffer = io.BytesIO()
+    df.to_csv(buffer, index=False, encoding="utf-8", chunksize=10000)
+    return buffer.getvalue()
+
 # -----------------------------
 # Sidebar controls
 # -----------------------------
@@ -151,6 +543,7 @@ with st.sidebar:
     sel_types = st.multiselect("Applicant Type", APPLICANT_TYPES, default=APPLICANT_TYPES)
     sel_status = st.multiselect("Status", STATUSES_UI, default=STATUSES_UI)
     count_value = st.number_input("Max records per API call (countValue)", min_value=1, max_value=200000, value=100000, step=1000)
+    force_refresh = st.checkbox("Force refresh (ignore cached results)")
 
     st.markdown("---")
     run = st.button("🚀 Scrape Now", use_container_width=True)
@@ -163,9 +556,28 @@ if run:
         st.warning("Please select at least one **Applicant Type** and one **Status**.")
         st.stop()
 
-    with st.spinner("Fetching data from CPCB API..."):
-        df = scrape(sel_types, sel_status, count_value)
+    # A new scrape starts with Excel not prepared, so it stays lazy per result.
+    st.session_state.pop("prepare_excel", None)
 
+    with st.spinner("Fetching data from CPCB API..."):
+        try:
+            if force_refresh:
+                # Bypass both caches for this filter combination only.
+                df = scrape_uncached(sel_types, sel_status, count_value, force_refresh=True)
+            else:
+                disk_version = cache_version(cache_path(sel_types, sel_status, count_value))
+                df = scrape(sel_types, sel_status, count_value, disk_version)
+        except PartialScrapeError as e:
+            df = e.df
+            st.warning(f"{e} Scrape again to retry the failed categories.")
+        st.session_state["scraped_df"] = df
+    st.session_state["scraped_at"] = dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+# Results live in session_state so download widgets can rerun the script
+# without losing the scraped table.
+df = st.session_state.get("scraped_df")
+
+if df is not None:
     # KPIs
     left, mid, right = st.columns(3)
     with left:
@@ -173,37 +585,40 @@ if run:
     with mid:
         st.metric("Unique Companies", f"{df['Name'].nunique():,}")
     with right:
-        st.metric("Downloaded On", dt.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        st.metric("Downloaded On", st.session_state["scraped_at"])
 
     st.markdown("### Preview")
     st.dataframe(df, use_container_width=True, height=480)
 
     # Downloads
     st.markdown("### Download")
-    excel_ok = True
-    engine_used = ""
-    try:
-        excel_bytes, engine_used = to_excel_bytes(df)
-    except Exception as e:
-        excel_ok = False
-        st.warning(
-            f"Excel export unavailable ({e}). "
-            "Add these lines to requirements.txt if missing:\n\n"
-            "openpyxl==3.1.5\nxlsxwriter==3.2.0"
-        )
-
-    if excel_ok:
-        st.success(f"Excel engine in use: **{engine_used}**")
-        st.download_button(
-            label="⬇️ Download Excel",
-            data=excel_bytes,
-            file_name="Scraped_dashboard.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        )
+    # Excel serialization is slow for large scrapes, so only do it on request.
+    if st.checkbox("Prepare Excel download", key="prepare_excel"):
+        excel_ok = True
+        engine_used = ""
+        try:
+            with st.spinner("Building Excel file..."):
+                excel_bytes, engine_used = to_excel_bytes(df)
+        except Exception as e:
+            excel_ok = False
+            st.warning(
+                f"Excel export unavailable ({e}). "
+                "Add these lines to requirements.txt if missing:\n\n"
+                "openpyxl==3.1.5\nxlsxwriter==3.2.0"
+            )
+
+        if excel_ok:
+            st.success(f"Excel engine in use: **{engine_used}**")
+            st.download_button(
+                label="⬇️ Download Excel",
+                data=excel_bytes,
+                file_name="Scraped_dashboard.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
 
     st.download_button(
         label="⬇️ Download CSV",
-        data=df.to_csv(index=False).encode("utf-8"),
+        data=to_csv_bytes(df),
         file_name="Scraped_dashboard.csv",
         mime="text/csv",
     )
@@ -216,5 +631,5 @@ else:
 # -----------------------------
 st.caption(
     "Note: SSL verification is disabled to mirror your original script. "
-    "Consider enabling certificate verification and adding rate limits in production."
+    "Consider enabling certificate verification in production."
 )